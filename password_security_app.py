@@ -1,16 +1,32 @@
 
+import binascii
+import csv
 import math
 import hashlib
 import requests
 import io
-import random
+import os
+import re
+import secrets
+import shelve
+import threading
 import time
-from collections import Counter
-from typing import List, Tuple, Dict, Optional
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from types import MappingProxyType
+from typing import List, Tuple, Dict, Optional, FrozenSet, Iterable, Set, NamedTuple, Mapping
 
 import streamlit as st
-import matplotlib.pyplot as plt
+import altair as alt
+import matplotlib
+matplotlib.use("Agg")  # headless server: render straight to PNG
+from matplotlib.figure import Figure
+import numpy as np
 import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Optional bcrypt (slow hashing demo)
 try:
@@ -40,290 +56,309 @@ st.markdown(DARK_CSS, unsafe_allow_html=True)
 
 # ========================= Translations =========================
 # NOTE: If you add UI text, also add its translation here with the same key.
-T = {
-    "en": {
-        "app_title": "🔐 Advanced Password Security Lab — Extended",
-        "app_caption": "Educational tool: local analysis; HIBP uses k‑anonymity for breach checks.",
-        "whats_new": "What's new in this multilingual extended version?",
-        "whats_new_points": "- Extra pattern detectors (palindrome, repeated substrings, keyboard walks)\n- Hash algorithm simulator (bcrypt optional)\n- Passphrase generator & history\n- Attack charts and scenarios\n- Full English/Hindi/Marathi UI and PDF\n- CSV/PDF exports",
-
-        "sidebar_settings": "⚙️ Settings & Tools",
-        "language": "Language / भाषा / भाषा निवडा",
-        "english": "English",
-        "hindi": "हिंदी",
-        "marathi": "मराठी",
-        "hibp_toggle": "Enable Breach Check (HIBP)",
-        "brute_speed": "Brute‑force attempts/sec",
-        "dict_speed": "Dictionary tries/sec",
-        "hybrid_speed": "Hybrid attempts/sec",
-        "bcrypt_rounds": "bcrypt rounds (if available)",
-        "dict_upload": "Load dictionary (optional)",
-        "upload_wordlist": "Upload wordlist (.txt)",
-        "bcrypt_ok": "bcrypt library available",
-        "bcrypt_missing": "bcrypt not installed — bcrypt simulation disabled (optional).",
-
-        "analyze_header": "Analyze a Password",
-        "enter_password": "Enter a password (processed locally):",
-        "strength": "Strength",
-        "entropy_keyspace": "Entropy & Keyspace",
-        "charset_size": "Charset size",
-        "keyspace": "Keyspace",
-        "keyspace_entropy": "Keyspace entropy",
-        "shannon_entropy": "Shannon entropy",
-        "patterns_found": "Patterns found",
-        "checking_hibp": "Checking Have I Been Pwned (k‑anonymity)…",
-        "found_breaches": "Found in known breaches {n} times.",
-        "not_found_breaches": "Not found in HIBP dataset (still use unique passwords).",
-        "breach_unavailable": "Breach check unavailable or offline.",
-
-        "estimates_header": "Estimated Crack Times",
-        "brute_avg": "Brute‑force (average)",
-        "brute_worst": "Brute‑force (worst)",
-        "dictionary_attack": "Dictionary",
-        "likely_hit": "likely hit",
-        "unlikely_hit": "unlikely",
-        "hybrid_attack": "Hybrid",
-
-        "hash_sim_header": "Hashing simulator (sample)",
-        "hash_algo": "Hash algorithm to sample",
-        "hash_compute_time": "computation time",
-
-        "tips_header": "Suggestions & Tips",
-        "looks_strong": "Password looks strong. Use long passphrases and a password manager.",
-        "tip_len": "Increase length to at least 12 characters (passphrases are great).",
-        "tip_lower": "Add lowercase letters.",
-        "tip_upper": "Add uppercase letters.",
-        "tip_digit": "Include digits.",
-        "tip_symbol": "Include special characters (!@#...).",
-        "tip_common": "Avoid common or leaked passwords.",
-
-        "save_to_history": "Save analysis to history",
-        "saved_history": "Saved to history",
-        "type_password": "Type a password above to analyze it (keeps analysis local).",
-
-        "passphrase_header": "Passphrase Generator",
-        "words_in_pass": "Words in passphrase",
-        "separator": "Separator",
-        "use_uploaded": "Use uploaded dictionary as wordlist (if available)",
-        "generate_pass": "Generate Passphrase",
-        "generated_pass": "Generated Passphrase",
-        "copy_pass": "Copy passphrase to clipboard",
-        "clipboard_note": "(Use your browser/OS clipboard — Streamlit cannot always write to clipboard)",
-
-        "visuals_header": "Quick Tools & Visuals",
-        "entropy_vs_length": "Entropy vs Length",
-        "charsets_to_include": "Character sets to include",
-        "max_len_chart": "Max length for chart",
-        "composition_header": "Password Composition (example)",
-        "enter_sample": "Enter sample for composition chart (optional)",
-
-        "scenarios_header": "Attack scenarios",
-        "show_crack_times": "Show crack times for a sample passphrase",
-        "scenario": "Scenario",
-        "time": "Time",
-
-        "history_header": "History & Exports",
-        "no_history": "No history saved yet. Analyze a password and click 'Save analysis to history'.",
-        "download_csv": "Download history (CSV)",
-        "clear_history": "Clear history",
-
-        "export_header": "Export Report",
-        "generate_pdf": "Generate PDF for last analysis",
-        "download_pdf": "Download PDF",
-        "no_pass_for_pdf": "No passphrase available for PDF generation. Generate one or analyze a password first.",
-
-        "footer": "Educational demo — not an enterprise auditor. Consider hashing policies, rate limiting, 2FA, and secure storage.",
-        "about": "About"
-    },
-    "hi": {
-        "app_title": "🔐 उन्नत पासवर्ड सुरक्षा लैब — विस्तारित",
-        "app_caption": "शैक्षणिक उपकरण: स्थानीय विश्लेषण; HIBP उल्लंघन जाँच के लिए k-अनामिता का उपयोग करता है।",
-        "whats_new": "इस बहुभाषी विस्तारित संस्करण में नया क्या है?",
-        "whats_new_points": "- अतिरिक्त पैटर्न डिटेक्टर (पलिंड्रोम, दोहराए गए सबस्ट्रिंग, कीबोर्ड वॉक)\n- हैश एल्गोरिद्म सिम्युलेटर (bcrypt वैकल्पिक)\n- पासफ्रेज जेनरेटर और इतिहास\n- अटैक चार्ट और परिदृश्य\n- पूर्ण अंग्रेज़ी/हिंदी/मराठी UI और PDF\n- CSV/PDF निर्यात",
-
-        "sidebar_settings": "⚙️ सेटिंग्स और टूल्स",
-        "language": "Language / भाषा / भाषा निवडा",
-        "english": "English",
-        "hindi": "हिंदी",
-        "marathi": "मराठी",
-        "hibp_toggle": "उल्लंघन जाँच (HIBP) सक्षम करें",
-        "brute_speed": "ब्रूट‑फोर्स प्रयास/सेकंड",
-        "dict_speed": "डिक्शनरी प्रयास/सेकंड",
-        "hybrid_speed": "हाइब्रिड प्रयास/सेकंड",
-        "bcrypt_rounds": "bcrypt राउंड (यदि उपलब्ध)",
-        "dict_upload": "डिक्शनरी लोड करें (वैकल्पिक)",
-        "upload_wordlist": "वर्डलिस्ट अपलोड करें (.txt)",
-        "bcrypt_ok": "bcrypt उपलब्ध है",
-        "bcrypt_missing": "bcrypt इंस्टॉल नहीं है — सिम्युलेशन अक्षम (वैकल्पिक)।",
-
-        "analyze_header": "पासवर्ड का विश्लेषण करें",
-        "enter_password": "पासवर्ड दर्ज करें (स्थानीय रूप से संसाधित):",
-        "strength": "मजबूती",
-        "entropy_keyspace": "एंट्रॉपी और की‑स्पेस",
-        "charset_size": "करेक्टर सेट आकार",
-        "keyspace": "की‑स्पेस",
-        "keyspace_entropy": "की‑स्पेस एंट्रॉपी",
-        "shannon_entropy": "शैनन एंट्रॉपी",
-        "patterns_found": "पैटर्न मिले",
-        "checking_hibp": "Have I Been Pwned की जाँच हो रही है (k‑अनामिता)…",
-        "found_breaches": "ज्ञात उल्लंघनों में {n} बार पाया गया।",
-        "not_found_breaches": "HIBP डेटा सेट में नहीं मिला (फिर भी अनूठे पासवर्ड का उपयोग करें)।",
-        "breach_unavailable": "उल्लंघन जाँच उपलब्ध नहीं है या ऑफ़लाइन है।",
-
-        "estimates_header": "अनुमानित क्रैक समय",
-        "brute_avg": "ब्रूट‑फोर्स (औसत)",
-        "brute_worst": "ब्रूट‑फोर्स (सबसे खराब)",
-        "dictionary_attack": "डिक्शनरी",
-        "likely_hit": "संभावित हिट",
-        "unlikely_hit": "असंभावित",
-        "hybrid_attack": "हाइब्रिड",
-
-        "hash_sim_header": "हैशिंग सिम्युलेटर (नमूना)",
-        "hash_algo": "हैश एल्गोरिद्म चुनें",
-        "hash_compute_time": "गणना समय",
-
-        "tips_header": "सुझाव और टिप्स",
-        "looks_strong": "पासवर्ड मजबूत दिखता है। लंबे पासफ्रेज और पासवर्ड मैनेजर का उपयोग करें।",
-        "tip_len": "लंबाई कम से कम 12 अक्षर करें (पासफ्रेज उत्तम हैं)।",
-        "tip_lower": "छोटे अक्षर जोड़ें।",
-        "tip_upper": "बड़े अक्षर जोड़ें।",
-        "tip_digit": "अंकों को शामिल करें।",
-        "tip_symbol": "विशेष वर्ण शामिल करें (!@#...)।",
-        "tip_common": "सामान्य या लीक पासवर्ड से बचें।",
-
-        "save_to_history": "विश्लेषण इतिहास में सहेजें",
-        "saved_history": "इतिहास में सहेजा गया",
-        "type_password": "ऊपर पासवर्ड टाइप करें — विश्लेषण स्थानीय रहता है।",
-
-        "passphrase_header": "पासफ्रेज जेनरेटर",
-        "words_in_pass": "पासफ्रेज में शब्दों की संख्या",
-        "separator": "विभाजक",
-        "use_uploaded": "अपलोडेड डिक्शनरी को वर्डलिस्ट के रूप में उपयोग करें (यदि उपलब्ध)",
-        "generate_pass": "पासफ्रेज उत्पन्न करें",
-        "generated_pass": "उत्पन्न पासफ्रेज",
-        "copy_pass": "पासफ्रेज कॉपी करें",
-        "clipboard_note": "(ब्राउज़र/OS क्लिपबोर्ड का उपयोग करें — Streamlit हमेशा सीधे कॉपी नहीं कर सकता)",
-
-        "visuals_header": "त्वरित टूल और विज़ुअल्स",
-        "entropy_vs_length": "लंबाई के मुकाबले एंट्रॉपी",
-        "charsets_to_include": "शामिल करने के लिए करेक्टर सेट",
-        "max_len_chart": "चार्ट के लिए अधिकतम लंबाई",
-        "composition_header": "पासवर्ड संरचना (उदाहरण)",
-        "enter_sample": "संरचना चार्ट के लिए नमूना दर्ज करें (वैकल्पिक)",
-
-        "scenarios_header": "अटैक परिदृश्य",
-        "show_crack_times": "नमूना पासफ्रेज के लिए क्रैक समय दिखाएँ",
-        "scenario": "परिदृश्य",
-        "time": "समय",
-
-        "history_header": "इतिहास और निर्यात",
-        "no_history": "अभी तक कोई इतिहास नहीं। पासवर्ड का विश्लेषण करें और 'इतिहास में सहेजें' क्लिक करें।",
-        "download_csv": "इतिहास डाउनलोड करें (CSV)",
-        "clear_history": "इतिहास साफ़ करें",
-
-        "export_header": "रिपोर्ट निर्यात",
-        "generate_pdf": "आखिरी विश्लेषण के लिए PDF बनाएँ",
-        "download_pdf": "PDF डाउनलोड करें",
-        "no_pass_for_pdf": "PDF के लिए कोई पासफ्रेज उपलब्ध नहीं। पहले पासफ्रेज बनाएँ या पासवर्ड विश्लेषित करें।",
-
-        "footer": "शैक्षणिक डेमो — एंटरप्राइज़ ऑडिटर नहीं। हैशिंग नीतियाँ, रेट लिमिटिंग, 2FA और सुरक्षित स्टोरेज पर विचार करें।",
-        "about": "परिचय"
-    },
-    "mr": {
-        "app_title": "🔐 उन्नत पासवर्ड सुरक्षा प्रयोगशाळा — विस्तारित",
-        "app_caption": "শैक्षणिक साधन: स्थानिक विश्लेषण; HIBP मध्ये k‑अनामिकता वापरली जाते.",
-        "whats_new": "या बहुभाषिक विस्तारित आवृत्तीमध्ये नवीन काय?",
-        "whats_new_points": "- अतिरिक्त पॅटर्न तपासणी (पालिंड्रोम, पुनरावृत्ती सबस्ट्रिंग, कीबोर्ड वॉक)\n- हॅश अल्गोरिदम सिम्युलेटर (bcrypt वैकल्पिक)\n- पासफ्रेज जनरेटर आणि इतिहास\n- हल्ला चार्ट आणि परिदृश्य\n- संपूर्ण इंग्रजी/हिंदी/मराठी UI आणि PDF\n- CSV/PDF निर्यात",
-
-        "sidebar_settings": "⚙️ सेटिंग्ज आणि साधने",
-        "language": "Language / भाषा / भाषा निवडा",
-        "english": "English",
-        "hindi": "हिंदी",
-        "marathi": "मराठी",
-        "hibp_toggle": "उल्लंघन तपासणी (HIBP) सक्षम करा",
-        "brute_speed": "ब्रूट‑फोर्स प्रयत्न/सेकंद",
-        "dict_speed": "डिक्शनरी प्रयत्न/सेकंद",
-        "hybrid_speed": "हायब्रिड प्रयत्न/सेकंद",
-        "bcrypt_rounds": "bcrypt राउंड्स (उपलब्ध असल्यास)",
-        "dict_upload": "डिक्शनरी लोड करा (ऐच्छिक)",
-        "upload_wordlist": "वर्डलिस्ट अपलोड करा (.txt)",
-        "bcrypt_ok": "bcrypt उपलब्ध आहे",
-        "bcrypt_missing": "bcrypt इंस्टॉल नाही — सिम्युलेशन अक्षम (ऐच्छिक).",
-
-        "analyze_header": "पासवर्ड विश्लेषण करा",
-        "enter_password": "पासवर्ड टाका (स्थानिकरीत्या प्रक्रिया)",
-        "strength": "मजबूती",
-        "entropy_keyspace": "एन्ट्रॉपी आणि की‑स्पेस",
-        "charset_size": "कॅरेक्टर सेट आकार",
-        "keyspace": "की‑स्पेस",
-        "keyspace_entropy": "की‑स्पेस एन्ट्रॉपी",
-        "shannon_entropy": "शॅनन एन्ट्रॉपी",
-        "patterns_found": "आढळलेले पॅटर्न",
-        "checking_hibp": "Have I Been Pwned तपासत आहोत (k‑अनामिकता)…",
-        "found_breaches": "ज्ञात उल्लंघनांमध्ये {n} वेळा आढळले.",
-        "not_found_breaches": "HIBP डेटासेटमध्ये सापडले नाही (तरीही अद्वितीय पासवर्ड वापरा).",
-        "breach_unavailable": "उल्लंघन तपासणी उपलब्ध नाही किंवा ऑफलाइन आहे.",
-
-        "estimates_header": "अंदाजे क्रॅक वेळ",
-        "brute_avg": "ब्रूट‑फोर्स (सरासरी)",
-        "brute_worst": "ब्रूट‑फोर्स (सर्वात वाईट)",
-        "dictionary_attack": "डिक्शनरी",
-        "likely_hit": "हिट होण्याची शक्यता",
-        "unlikely_hit": "असंभाव्य",
-        "hybrid_attack": "हायब्रिड",
-
-        "hash_sim_header": "हॅशिंग सिम्युलेटर (नमुना)",
-        "hash_algo": "हॅश अल्गोरिदम निवडा",
-        "hash_compute_time": "गणना वेळ",
-
-        "tips_header": "सूचना आणि टिप्स",
-        "looks_strong": "पासवर्ड मजबूत दिसतो. लांब पासफ्रेज आणि पासवर्ड मॅनेजर वापरा.",
-        "tip_len": "लांबी किमान 12 अक्षरे करा (पासफ्रेज उत्तम).",
-        "tip_lower": "लघ्वाक्षरे जोडा.",
-        "tip_upper": "मोठी अक्षरे जोडा.",
-        "tip_digit": "अंके समाविष्ट करा.",
-        "tip_symbol": "विशेष चिन्हे समाविष्ट करा (!@#...).",
-        "tip_common": "सामान्य/लीक पासवर्ड टाळा.",
-
-        "save_to_history": "विश्लेषण इतिहासात जतन करा",
-        "saved_history": "इतिहासात जतन केले",
-        "type_password": "वर पासवर्ड टाइप करा — विश्लेषण स्थानिक राहते.",
-
-        "passphrase_header": "पासफ्रेज जनरेटर",
-        "words_in_pass": "पासफ्रेजमधील शब्दांची संख्या",
-        "separator": "विभाजक",
-        "use_uploaded": "अपलोड केलेली डिक्शनरी वर्डलिस्ट म्हणून वापरा (उपलब्ध असल्यास)",
-        "generate_pass": "पासफ्रेज तयार करा",
-        "generated_pass": "तयार केलेली पासफ्रेज",
-        "copy_pass": "पासफ्रेज कॉपी करा",
-        "clipboard_note": "(ब्राउझर/OS क्लिपबोर्ड वापरा — Streamlit नेहमी थेट कॉपी करू शकत नाही)",
-
-        "visuals_header": "जलद साधने आणि दृश्ये",
-        "entropy_vs_length": "लांबी विरुद्ध एन्ट्रॉपी",
-        "charsets_to_include": "समाविष्ट करण्यासाठी कॅरेक्टर सेट",
-        "max_len_chart": "चार्टसाठी कमाल लांबी",
-        "composition_header": "पासवर्ड संरचना (उदाहरण)",
-        "enter_sample": "संरचना चार्टसाठी नमुना प्रविष्ट करा (ऐच्छिक)",
-
-        "scenarios_header": "हल्ल्याची परिदृश्ये",
-        "show_crack_times": "नमुना पासफ्रेजसाठी क्रॅक वेळ दर्शवा",
-        "scenario": "परिदृশ্য",
-        "time": "वेळ",
-
-        "history_header": "इतिहास आणि निर्यात",
-        "no_history": "अजून इतिहास नाही. पासवर्डचे विश्लेषण करा आणि 'इतिहासात जतन करा' क्लिक करा.",
-        "download_csv": "इतिहास डाउनलोड करा (CSV)",
-        "clear_history": "इतिहास साफ करा",
-
-        "export_header": "अहवाल निर्यात",
-        "generate_pdf": "शेवटच्या विश्लेषणासाठी PDF तयार करा",
-        "download_pdf": "PDF डाउनलोड करा",
-        "no_pass_for_pdf": "PDF साठी पासफ्रेज उपलब्ध नाही. प्रथम पासफ्रेज तयार करा किंवा पासवर्ड विश्लेषित करा.",
-
-        "footer": "शैक्षणिक डेमो — एंटरप्राइझ ऑडिटर नाही. हॅशिंग धोरणे, रेट-लिमिटिंग, 2FA आणि सुरक्षित स्टोरेज विचारात घ्या.",
-        "about": "परिचय"
-    },
-}
+@st.cache_resource(show_spinner=False)
+def _load_translations() -> MappingProxyType:
+    # Function body runs once per process, not on every script rerun
+    translations = {
+        "en": {
+            "app_title": "🔐 Advanced Password Security Lab — Extended",
+            "app_caption": "Educational tool: local analysis; HIBP uses k‑anonymity for breach checks.",
+            "whats_new": "What's new in this multilingual extended version?",
+            "whats_new_points": "- Extra pattern detectors (palindrome, repeated substrings, keyboard walks)\n- Hash algorithm simulator (bcrypt optional)\n- Passphrase generator & history\n- Attack charts and scenarios\n- Full English/Hindi/Marathi UI and PDF\n- CSV/PDF exports",
+
+            "sidebar_settings": "⚙️ Settings & Tools",
+            "language": "Language / भाषा / भाषा निवडा",
+            "english": "English",
+            "hindi": "हिंदी",
+            "marathi": "मराठी",
+            "hibp_toggle": "Enable Breach Check (HIBP)",
+            "brute_speed": "Brute‑force attempts/sec",
+            "dict_speed": "Dictionary tries/sec",
+            "hybrid_speed": "Hybrid attempts/sec",
+            "bcrypt_rounds": "bcrypt rounds (auto-calibrated to ~{ms} ms): {n}",
+            "dict_upload": "Load dictionary (optional)",
+            "upload_wordlist": "Upload wordlist (.txt)",
+            "bcrypt_ok": "bcrypt library available",
+            "real_bcrypt": "Run real bcrypt hashes (slow)",
+            "bcrypt_missing": "bcrypt not installed — bcrypt simulation disabled (optional).",
+
+            "analyze_header": "Analyze a Password",
+            "enter_password": "Enter a password (processed locally):",
+            "strength": "Strength",
+            "entropy_keyspace": "Entropy & Keyspace",
+            "charset_size": "Charset size",
+            "keyspace": "Keyspace",
+            "keyspace_entropy": "Keyspace entropy",
+            "shannon_entropy": "Shannon entropy",
+            "patterns_found": "Patterns found",
+            "checking_hibp": "Checking Have I Been Pwned (k‑anonymity)…",
+            "check_breaches": "Check breaches (HIBP)",
+            "breach_not_checked": "Breach check not run yet for this password.",
+            "found_breaches": "Found in known breaches {n} times.",
+            "not_found_breaches": "Not found in HIBP dataset (still use unique passwords).",
+            "breach_unavailable": "Breach check unavailable or offline.",
+
+            "estimates_header": "Estimated Crack Times",
+            "brute_avg": "Brute‑force (average)",
+            "brute_worst": "Brute‑force (worst)",
+            "dictionary_attack": "Dictionary",
+            "likely_hit": "likely hit",
+            "unlikely_hit": "unlikely",
+            "hybrid_attack": "Hybrid",
+
+            "hash_sim_header": "Hashing simulator (sample)",
+            "hash_algo": "Hash algorithm to sample",
+            "hash_compute_time": "computation time",
+
+            "tips_header": "Suggestions & Tips",
+            "looks_strong": "Password looks strong. Use long passphrases and a password manager.",
+            "tip_len": "Increase length to at least 12 characters (passphrases are great).",
+            "tip_lower": "Add lowercase letters.",
+            "tip_upper": "Add uppercase letters.",
+            "tip_digit": "Include digits.",
+            "tip_symbol": "Include special characters (!@#...).",
+            "tip_common": "Avoid common or leaked passwords.",
+
+            "save_to_history": "Save analysis to history",
+            "saved_history": "Saved to history",
+            "type_password": "Type a password above to analyze it (keeps analysis local).",
+
+            "passphrase_header": "Passphrase Generator",
+            "words_in_pass": "Words in passphrase",
+            "separator": "Separator",
+            "use_uploaded": "Use uploaded dictionary as wordlist (if available)",
+            "generate_pass": "Generate Passphrase",
+            "generated_pass": "Generated Passphrase",
+            "copy_pass": "Copy passphrase to clipboard",
+            "clipboard_note": "(Use your browser/OS clipboard — Streamlit cannot always write to clipboard)",
+
+            "visuals_header": "Quick Tools & Visuals",
+            "entropy_vs_length": "Entropy vs Length",
+            "charsets_to_include": "Character sets to include",
+            "max_len_chart": "Max length for chart",
+            "update_chart": "Update chart",
+            "composition_header": "Password Composition (example)",
+            "enter_sample": "Enter sample for composition chart (optional)",
+
+            "scenarios_header": "Attack scenarios",
+            "show_crack_times": "Show crack times for a sample passphrase",
+            "scenario": "Scenario",
+            "time": "Time",
+
+            "history_header": "History & Exports",
+            "no_history": "No history saved yet. Analyze a password and click 'Save analysis to history'.",
+            "download_csv": "Download history (CSV)",
+            "clear_history": "Clear history",
+
+            "export_header": "Export Report",
+            "generate_pdf": "Generate PDF for last analysis",
+            "download_pdf": "Download PDF",
+            "no_pass_for_pdf": "No passphrase available for PDF generation. Generate one or analyze a password first.",
+
+            "footer": "Educational demo — not an enterprise auditor. Consider hashing policies, rate limiting, 2FA, and secure storage.",
+            "about": "About"
+        },
+        "hi": {
+            "app_title": "🔐 उन्नत पासवर्ड सुरक्षा लैब — विस्तारित",
+            "app_caption": "शैक्षणिक उपकरण: स्थानीय विश्लेषण; HIBP उल्लंघन जाँच के लिए k-अनामिता का उपयोग करता है।",
+            "whats_new": "इस बहुभाषी विस्तारित संस्करण में नया क्या है?",
+            "whats_new_points": "- अतिरिक्त पैटर्न डिटेक्टर (पलिंड्रोम, दोहराए गए सबस्ट्रिंग, कीबोर्ड वॉक)\n- हैश एल्गोरिद्म सिम्युलेटर (bcrypt वैकल्पिक)\n- पासफ्रेज जेनरेटर और इतिहास\n- अटैक चार्ट और परिदृश्य\n- पूर्ण अंग्रेज़ी/हिंदी/मराठी UI और PDF\n- CSV/PDF निर्यात",
+
+            "sidebar_settings": "⚙️ सेटिंग्स और टूल्स",
+            "language": "Language / भाषा / भाषा निवडा",
+            "english": "English",
+            "hindi": "हिंदी",
+            "marathi": "मराठी",
+            "hibp_toggle": "उल्लंघन जाँच (HIBP) सक्षम करें",
+            "brute_speed": "ब्रूट‑फोर्स प्रयास/सेकंड",
+            "dict_speed": "डिक्शनरी प्रयास/सेकंड",
+            "hybrid_speed": "हाइब्रिड प्रयास/सेकंड",
+            "bcrypt_rounds": "bcrypt राउंड (~{ms} ms के लिए स्वतः कैलिब्रेटेड): {n}",
+            "dict_upload": "डिक्शनरी लोड करें (वैकल्पिक)",
+            "upload_wordlist": "वर्डलिस्ट अपलोड करें (.txt)",
+            "bcrypt_ok": "bcrypt उपलब्ध है",
+            "real_bcrypt": "असली bcrypt हैश चलाएँ (धीमा)",
+            "bcrypt_missing": "bcrypt इंस्टॉल नहीं है — सिम्युलेशन अक्षम (वैकल्पिक)।",
+
+            "analyze_header": "पासवर्ड का विश्लेषण करें",
+            "enter_password": "पासवर्ड दर्ज करें (स्थानीय रूप से संसाधित):",
+            "strength": "मजबूती",
+            "entropy_keyspace": "एंट्रॉपी और की‑स्पेस",
+            "charset_size": "करेक्टर सेट आकार",
+            "keyspace": "की‑स्पेस",
+            "keyspace_entropy": "की‑स्पेस एंट्रॉपी",
+            "shannon_entropy": "शैनन एंट्रॉपी",
+            "patterns_found": "पैटर्न मिले",
+            "checking_hibp": "Have I Been Pwned की जाँच हो रही है (k‑अनामिता)…",
+            "check_breaches": "उल्लंघन जाँचें (HIBP)",
+            "breach_not_checked": "इस पासवर्ड के लिए उल्लंघन जाँच अभी नहीं हुई है।",
+            "found_breaches": "ज्ञात उल्लंघनों में {n} बार पाया गया।",
+            "not_found_breaches": "HIBP डेटा सेट में नहीं मिला (फिर भी अनूठे पासवर्ड का उपयोग करें)।",
+            "breach_unavailable": "उल्लंघन जाँच उपलब्ध नहीं है या ऑफ़लाइन है।",
+
+            "estimates_header": "अनुमानित क्रैक समय",
+            "brute_avg": "ब्रूट‑फोर्स (औसत)",
+            "brute_worst": "ब्रूट‑फोर्स (सबसे खराब)",
+            "dictionary_attack": "डिक्शनरी",
+            "likely_hit": "संभावित हिट",
+            "unlikely_hit": "असंभावित",
+            "hybrid_attack": "हाइब्रिड",
+
+            "hash_sim_header": "हैशिंग सिम्युलेटर (नमूना)",
+            "hash_algo": "हैश एल्गोरिद्म चुनें",
+            "hash_compute_time": "गणना समय",
+
+            "tips_header": "सुझाव और टिप्स",
+            "looks_strong": "पासवर्ड मजबूत दिखता है। लंबे पासफ्रेज और पासवर्ड मैनेजर का उपयोग करें।",
+            "tip_len": "लंबाई कम से कम 12 अक्षर करें (पासफ्रेज उत्तम हैं)।",
+            "tip_lower": "छोटे अक्षर जोड़ें।",
+            "tip_upper": "बड़े अक्षर जोड़ें।",
+            "tip_digit": "अंकों को शामिल करें।",
+            "tip_symbol": "विशेष वर्ण शामिल करें (!@#...)।",
+            "tip_common": "सामान्य या लीक पासवर्ड से बचें।",
+
+            "save_to_history": "विश्लेषण इतिहास में सहेजें",
+            "saved_history": "इतिहास में सहेजा गया",
+            "type_password": "ऊपर पासवर्ड टाइप करें — विश्लेषण स्थानीय रहता है।",
+
+            "passphrase_header": "पासफ्रेज जेनरेटर",
+            "words_in_pass": "पासफ्रेज में शब्दों की संख्या",
+            "separator": "विभाजक",
+            "use_uploaded": "अपलोडेड डिक्शनरी को वर्डलिस्ट के रूप में उपयोग करें (यदि उपलब्ध)",
+            "generate_pass": "पासफ्रेज उत्पन्न करें",
+            "generated_pass": "उत्पन्न पासफ्रेज",
+            "copy_pass": "पासफ्रेज कॉपी करें",
+            "clipboard_note": "(ब्राउज़र/OS क्लिपबोर्ड का उपयोग करें — Streamlit हमेशा सीधे कॉपी नहीं कर सकता)",
+
+            "visuals_header": "त्वरित टूल और विज़ुअल्स",
+            "entropy_vs_length": "लंबाई के मुकाबले एंट्रॉपी",
+            "charsets_to_include": "शामिल करने के लिए करेक्टर सेट",
+            "max_len_chart": "चार्ट के लिए अधिकतम लंबाई",
+            "update_chart": "चार्ट अपडेट करें",
+            "composition_header": "पासवर्ड संरचना (उदाहरण)",
+            "enter_sample": "संरचना चार्ट के लिए नमूना दर्ज करें (वैकल्पिक)",
+
+            "scenarios_header": "अटैक परिदृश्य",
+            "show_crack_times": "नमूना पासफ्रेज के लिए क्रैक समय दिखाएँ",
+            "scenario": "परिदृश्य",
+            "time": "समय",
+
+            "history_header": "इतिहास और निर्यात",
+            "no_history": "अभी तक कोई इतिहास नहीं। पासवर्ड का विश्लेषण करें और 'इतिहास में सहेजें' क्लिक करें।",
+            "download_csv": "इतिहास डाउनलोड करें (CSV)",
+            "clear_history": "इतिहास साफ़ करें",
+
+            "export_header": "रिपोर्ट निर्यात",
+            "generate_pdf": "आखिरी विश्लेषण के लिए PDF बनाएँ",
+            "download_pdf": "PDF डाउनलोड करें",
+            "no_pass_for_pdf": "PDF के लिए कोई पासफ्रेज उपलब्ध नहीं। पहले पासफ्रेज बनाएँ या पासवर्ड विश्लेषित करें।",
+
+            "footer": "शैक्षणिक डेमो — एंटरप्राइज़ ऑडिटर नहीं। हैशिंग नीतियाँ, रेट लिमिटिंग, 2FA और सुरक्षित स्टोरेज पर विचार करें।",
+            "about": "परिचय"
+        },
+        "mr": {
+            "app_title": "🔐 उन्नत पासवर्ड सुरक्षा प्रयोगशाळा — विस्तारित",
+            "app_caption": "শैक्षणिक साधन: स्थानिक विश्लेषण; HIBP मध्ये k‑अनामिकता वापरली जाते.",
+            "whats_new": "या बहुभाषिक विस्तारित आवृत्तीमध्ये नवीन काय?",
+            "whats_new_points": "- अतिरिक्त पॅटर्न तपासणी (पालिंड्रोम, पुनरावृत्ती सबस्ट्रिंग, कीबोर्ड वॉक)\n- हॅश अल्गोरिदम सिम्युलेटर (bcrypt वैकल्पिक)\n- पासफ्रेज जनरेटर आणि इतिहास\n- हल्ला चार्ट आणि परिदृश्य\n- संपूर्ण इंग्रजी/हिंदी/मराठी UI आणि PDF\n- CSV/PDF निर्यात",
+
+            "sidebar_settings": "⚙️ सेटिंग्ज आणि साधने",
+            "language": "Language / भाषा / भाषा निवडा",
+            "english": "English",
+            "hindi": "हिंदी",
+            "marathi": "मराठी",
+            "hibp_toggle": "उल्लंघन तपासणी (HIBP) सक्षम करा",
+            "brute_speed": "ब्रूट‑फोर्स प्रयत्न/सेकंद",
+            "dict_speed": "डिक्शनरी प्रयत्न/सेकंद",
+            "hybrid_speed": "हायब्रिड प्रयत्न/सेकंद",
+            "bcrypt_rounds": "bcrypt राउंड्स (~{ms} ms साठी स्वयं-कॅलिब्रेट): {n}",
+            "dict_upload": "डिक्शनरी लोड करा (ऐच्छिक)",
+            "upload_wordlist": "वर्डलिस्ट अपलोड करा (.txt)",
+            "bcrypt_ok": "bcrypt उपलब्ध आहे",
+            "real_bcrypt": "खरे bcrypt हॅश चालवा (हळू)",
+            "bcrypt_missing": "bcrypt इंस्टॉल नाही — सिम्युलेशन अक्षम (ऐच्छिक).",
+
+            "analyze_header": "पासवर्ड विश्लेषण करा",
+            "enter_password": "पासवर्ड टाका (स्थानिकरीत्या प्रक्रिया)",
+            "strength": "मजबूती",
+            "entropy_keyspace": "एन्ट्रॉपी आणि की‑स्पेस",
+            "charset_size": "कॅरेक्टर सेट आकार",
+            "keyspace": "की‑स्पेस",
+            "keyspace_entropy": "की‑स्पेस एन्ट्रॉपी",
+            "shannon_entropy": "शॅनन एन्ट्रॉपी",
+            "patterns_found": "आढळलेले पॅटर्न",
+            "checking_hibp": "Have I Been Pwned तपासत आहोत (k‑अनामिकता)…",
+            "check_breaches": "उल्लंघन तपासा (HIBP)",
+            "breach_not_checked": "या पासवर्डसाठी उल्लंघन तपासणी अजून झालेली नाही.",
+            "found_breaches": "ज्ञात उल्लंघनांमध्ये {n} वेळा आढळले.",
+            "not_found_breaches": "HIBP डेटासेटमध्ये सापडले नाही (तरीही अद्वितीय पासवर्ड वापरा).",
+            "breach_unavailable": "उल्लंघन तपासणी उपलब्ध नाही किंवा ऑफलाइन आहे.",
+
+            "estimates_header": "अंदाजे क्रॅक वेळ",
+            "brute_avg": "ब्रूट‑फोर्स (सरासरी)",
+            "brute_worst": "ब्रूट‑फोर्स (सर्वात वाईट)",
+            "dictionary_attack": "डिक्शनरी",
+            "likely_hit": "हिट होण्याची शक्यता",
+            "unlikely_hit": "असंभाव्य",
+            "hybrid_attack": "हायब्रिड",
+
+            "hash_sim_header": "हॅशिंग सिम्युलेटर (नमुना)",
+            "hash_algo": "हॅश अल्गोरिदम निवडा",
+            "hash_compute_time": "गणना वेळ",
+
+            "tips_header": "सूचना आणि टिप्स",
+            "looks_strong": "पासवर्ड मजबूत दिसतो. लांब पासफ्रेज आणि पासवर्ड मॅनेजर वापरा.",
+            "tip_len": "लांबी किमान 12 अक्षरे करा (पासफ्रेज उत्तम).",
+            "tip_lower": "लघ्वाक्षरे जोडा.",
+            "tip_upper": "मोठी अक्षरे जोडा.",
+            "tip_digit": "अंके समाविष्ट करा.",
+            "tip_symbol": "विशेष चिन्हे समाविष्ट करा (!@#...).",
+            "tip_common": "सामान्य/लीक पासवर्ड टाळा.",
+
+            "save_to_history": "विश्लेषण इतिहासात जतन करा",
+            "saved_history": "इतिहासात जतन केले",
+            "type_password": "वर पासवर्ड टाइप करा — विश्लेषण स्थानिक राहते.",
+
+            "passphrase_header": "पासफ्रेज जनरेटर",
+            "words_in_pass": "पासफ्रेजमधील शब्दांची संख्या",
+            "separator": "विभाजक",
+            "use_uploaded": "अपलोड केलेली डिक्शनरी वर्डलिस्ट म्हणून वापरा (उपलब्ध असल्यास)",
+            "generate_pass": "पासफ्रेज तयार करा",
+            "generated_pass": "तयार केलेली पासफ्रेज",
+            "copy_pass": "पासफ्रेज कॉपी करा",
+            "clipboard_note": "(ब्राउझर/OS क्लिपबोर्ड वापरा — Streamlit नेहमी थेट कॉपी करू शकत नाही)",
+
+            "visuals_header": "जलद साधने आणि दृश्ये",
+            "entropy_vs_length": "लांबी विरुद्ध एन्ट्रॉपी",
+            "charsets_to_include": "समाविष्ट करण्यासाठी कॅरेक्टर सेट",
+            "max_len_chart": "चार्टसाठी कमाल लांबी",
+            "update_chart": "चार्ट अपडेट करा",
+            "composition_header": "पासवर्ड संरचना (उदाहरण)",
+            "enter_sample": "संरचना चार्टसाठी नमुना प्रविष्ट करा (ऐच्छिक)",
+
+            "scenarios_header": "हल्ल्याची परिदृश्ये",
+            "show_crack_times": "नमुना पासफ्रेजसाठी क्रॅक वेळ दर्शवा",
+            "scenario": "परिदृশ্য",
+            "time": "वेळ",
+
+            "history_header": "इतिहास आणि निर्यात",
+            "no_history": "अजून इतिहास नाही. पासवर्डचे विश्लेषण करा आणि 'इतिहासात जतन करा' क्लिक करा.",
+            "download_csv": "इतिहास डाउनलोड करा (CSV)",
+            "clear_history": "इतिहास साफ करा",
+
+            "export_header": "अहवाल निर्यात",
+            "generate_pdf": "शेवटच्या विश्लेषणासाठी PDF तयार करा",
+            "download_pdf": "PDF डाउनलोड करा",
+            "no_pass_for_pdf": "PDF साठी पासफ्रेज उपलब्ध नाही. प्रथम पासफ्रेज तयार करा किंवा पासवर्ड विश्लेषित करा.",
+
+            "footer": "शैक्षणिक डेमो — एंटरप्राइझ ऑडिटर नाही. हॅशिंग धोरणे, रेट-लिमिटिंग, 2FA आणि सुरक्षित स्टोरेज विचारात घ्या.",
+            "about": "परिचय"
+        },
+    }
+    return MappingProxyType({lang: MappingProxyType(texts) for lang, texts in translations.items()})
+
+
+T = _load_translations()
 
 # ========================= Constants & Samples =========================
 CHARSETS = {
@@ -334,24 +369,24 @@ CHARSETS = {
     "All printable ASCII": 95,
 }
 
-WEAK_PASSWORDS = {
+WEAK_PASSWORDS = frozenset({
     "123456","password","12345678","qwerty","abc123",
     "111111","123123","password1","iloveyou","admin",
-}
+})
 
 KEYBOARD_ROWS = ["1234567890","qwertyuiop","asdfghjkl","zxcvbnm"]
 
-DEFAULT_DICT_SAMPLE = [
+DEFAULT_DICT_SAMPLE = (
     "password","qwerty","dragon","iloveyou","monkey","letmein",
     "football","admin","welcome","login","sunshine","princess"
-]
+)
 
-DICEWARE_SAMPLE = [
+DICEWARE_SAMPLE = (
     "alpha","bravo","charlie","delta","echo","foxtrot","golf","hotel",
     "india","juliet","kilo","lima","mike","november","oscar","papa",
-]
+)
 
-LEET_MAP = {"a":"4@","e":"3","i":"1!","o":"0","s":"$5","t":"7","+":"t"}
+LEET_MAP = {"a":"4@","e":"3","i":"1!","o":"0","s":"$5","t":"7+"}
 
 # ========================= Helpers =========================
 
@@ -366,8 +401,44 @@ def tr(lang: str, key: str, **fmt) -> str:
     return text
 
 
-def log2(x: float) -> float:
-    return math.log(x, 2) if x > 0 else 0.0
+# strength_score() tips (English) -> translation keys
+_TIP_KEYS = {
+    "Increase length to at least 12 characters (passphrases are great).": "tip_len",
+    "Add lowercase letters.": "tip_lower",
+    "Add uppercase letters.": "tip_upper",
+    "Include digits.": "tip_digit",
+    "Include special characters (!@#...).": "tip_symbol",
+    "Avoid common or leaked passwords.": "tip_common",
+}
+
+
+@st.cache_resource(show_spinner=False)
+def tips_map_for(lang: str) -> MappingProxyType:
+    return MappingProxyType({tip: tr(lang, key) for tip, key in _TIP_KEYS.items()})
+
+
+# Lookup tables below are built by st.cache_resource functions: Streamlit
+# re-executes this script on every rerun, so a plain module-level build
+# would run each time, while the cached builders run once per process.
+
+@st.cache_resource(show_spinner=False)
+def _log2_charset_table() -> Tuple[float, ...]:
+    # log2 of every charset size the app can produce, as plain floats so a
+    # lookup is a tuple index rather than a NumPy scalar
+    return tuple(np.log2(np.arange(1, sum(CHARSETS.values()) + 1)).tolist())
+
+
+_LOG2_CHARSET = _log2_charset_table()
+
+
+def keyspace_entropy_bits(length: int, charset_size: int) -> float:
+    if charset_size <= 0: return 0.0
+    if charset_size <= len(_LOG2_CHARSET):
+        return length * _LOG2_CHARSET[charset_size - 1]
+    return length * math.log2(charset_size)
+
+
+_TIME_UNITS = ("year", "day", "hour", "minute", "second")
 
 
 def pretty_time(seconds: float) -> str:
@@ -377,100 +448,152 @@ def pretty_time(seconds: float) -> str:
         return "practically infinite"
     if seconds < 1e-6:
         return "≈ 0 sec"
-    s = int(seconds)
-    units = [("year", 365*24*3600),("day",24*3600),("hour",3600),("minute",60),("second",1)]
-    parts = []
-    for name, val in units:
-        if s >= val:
-            qty = s // val
-            s -= qty * val
-            parts.append(f"{qty} {name}{'s' if qty != 1 else ''}")
+    y, s = divmod(int(seconds), 365*24*3600)
+    d, s = divmod(s, 24*3600)
+    h, s = divmod(s, 3600)
+    m, s = divmod(s, 60)
+    parts = [f"{qty} {name}{'s' if qty != 1 else ''}" for qty, name in zip((y, d, h, m, s), _TIME_UNITS) if qty]
     return ", ".join(parts) if parts else "0 seconds"
 
 
-def detect_charset_size(password: str) -> Tuple[int, int, Dict[str, bool]]:
-    has_lower = any(c.islower() for c in password)
-    has_upper = any(c.isupper() for c in password)
-    has_digit = any(c.isdigit() for c in password)
-    has_symbol = any(not c.isalnum() for c in password)
+@st.cache_resource(show_spinner=False)
+def _class_tag_table() -> Dict[int, str]:
+    # ASCII char -> class tag, so one translate() classifies a whole string
+    return str.maketrans({
+        chr(i): "l" if chr(i).islower() else "u" if chr(i).isupper() else "d" if chr(i).isdigit() else "s"
+        for i in range(128)
+    })
+
+
+_CLASS_TAGS = _class_tag_table()
+
+
+# Below this length the translate + Counter path beats NumPy's call overhead
+_NUMPY_CLASSIFY_MIN = 128
+
+
+@lru_cache(maxsize=256)
+def char_class_counts(s: str) -> Tuple[int, int, int, int]:
+    """(lower, upper, digit, symbol) character counts."""
+    if s.isascii() and len(s) >= _NUMPY_CLASSIFY_MIN:
+        # Long samples: one histogram over the bytes, then range sums
+        bc = np.bincount(np.frombuffer(s.encode("ascii"), dtype=np.uint8), minlength=128)
+        lower, upper, digit = int(bc[97:123].sum()), int(bc[65:91].sum()), int(bc[48:58].sum())
+        return lower, upper, digit, len(s) - lower - upper - digit
+    if s.isascii():
+        tags = Counter(s.translate(_CLASS_TAGS))
+        return tags["l"], tags["u"], tags["d"], tags["s"]
+    return (sum(c.islower() for c in s), sum(c.isupper() for c in s),
+            sum(c.isdigit() for c in s), sum(not c.isalnum() for c in s))
+
+
+@lru_cache(maxsize=256)
+def detect_charset_size(password: str) -> Tuple[int, Mapping[str, bool]]:
+    if password.isascii():
+        # Only presence matters here, so the set of class tags is enough
+        tags = set(password.translate(_CLASS_TAGS))
+        has_lower, has_upper, has_digit, has_symbol = ("l" in tags, "u" in tags, "d" in tags, "s" in tags)
+    else:
+        # Presence only: stop as soon as every class has been seen. Not an
+        # elif chain, since some characters (e.g. circled letters) are both
+        # lowercase and non-alphanumeric.
+        has_lower = has_upper = has_digit = has_symbol = False
+        for c in password:
+            has_lower = has_lower or c.islower()
+            has_upper = has_upper or c.isupper()
+            has_digit = has_digit or c.isdigit()
+            has_symbol = has_symbol or not c.isalnum()
+            if has_lower and has_upper and has_digit and has_symbol:
+                break
     size = 0
     if has_lower:  size += CHARSETS["Lowercase (a-z)"]
     if has_upper:  size += CHARSETS["Uppercase (A-Z)"]
     if has_digit:  size += CHARSETS["Digits (0-9)"]
     if has_symbol: size += CHARSETS["Symbols (!@#...)"]
     if size == 0: size = CHARSETS["All printable ASCII"]
-    flags = {"lower":has_lower,"upper":has_upper,"digit":has_digit,"symbol":has_symbol}
-    return size ** len(password), size, flags
+    # Read-only: the lru_cache hands the same object to every caller
+    flags = MappingProxyType({"lower":has_lower,"upper":has_upper,"digit":has_digit,"symbol":has_symbol})
+    return size, flags
 
 
-def keyspace_by_length(length: int, selected_sets: List[str]) -> Tuple[int, int]:
+def keyspace_by_length(length: int, selected_sets: List[str]) -> Tuple[float, int]:
+    """(keyspace in bits, charset size) for a length and chosen sets."""
     size = sum(CHARSETS[n] for n in selected_sets) if selected_sets else 0
     if size == 0: size = CHARSETS["All printable ASCII"]
-    return size ** length, size
+    return keyspace_entropy_bits(length, size), size
+
 
+def keyspace_label(charset_size: int, length: int) -> str:
+    # Exact while it fits in 64 bits; beyond that, derive the decimal
+    # exponent from the log so no huge integer is ever built
+    bits = keyspace_entropy_bits(length, charset_size)
+    if bits <= 64:
+        return f"{charset_size ** length:,}"
+    exp10 = bits * math.log10(2)
+    e = int(exp10)
+    # Round first: 9.999... must carry into the exponent, not print as 10.00
+    m = round(10 ** (exp10 - e), 2)
+    if m >= 10:
+        m, e = m / 10, e + 1
+    return f"≈ {m:.2f} × 10^{e}"
 
+
+@lru_cache(maxsize=256)
 def shannon_entropy_bits(s: str) -> float:
     if not s: return 0.0
-    counts = Counter(s)
+    # ASCII: histogram the raw bytes; otherwise count whole code points
+    if s.isascii():
+        counts = np.bincount(np.frombuffer(s.encode("ascii"), dtype=np.uint8))
+        counts = counts[counts > 0]
+    else:
+        _, counts = np.unique(np.frombuffer(s.encode("utf-32-le"), dtype=np.uint32), return_counts=True)
     n = len(s)
-    H = 0.0
-    for c in counts.values():
-        p = c / n
-        H -= p * math.log(p, 2)
-    return H * n
+    return float((counts * (np.log2(n) - np.log2(counts))).sum())
 
 # -------- Pattern detectors --------
 
-def find_sequences(password: str, min_len: int = 3) -> List[str]:
-    findings = []
-    p = password.lower()
-    alphabet = "abcdefghijklmnopqrstuvwxyz"
-    digits   = "0123456789"
-    universes = [alphabet, digits] + KEYBOARD_ROWS
-    for universe in universes:
-        for i in range(len(universe) - min_len + 1):
-            seq = universe[i:i+min_len]
-            if seq in p:
-                findings.append(seq)
-        rev = universe[::-1]
-        for i in range(len(rev) - min_len + 1):
-            seq = rev[i:i+min_len]
-            if seq in p:
-                findings.append(seq)
-    return list(set(findings))
+_SEQUENCE_UNIVERSES = ("abcdefghijklmnopqrstuvwxyz", "0123456789", *KEYBOARD_ROWS)
+
+
+def _window_set(universes: Tuple[str, ...], size: int) -> FrozenSet[str]:
+    """Every length-`size` window of each universe, forwards and reversed."""
+    return frozenset(
+        u[i:i+size]
+        for base in universes for u in (base, base[::-1])
+        for i in range(len(u) - size + 1)
+    )
+
+
+# Every (overlapping) run of four decimal digits. \d matches any Unicode
+# decimal digit, the same set int() accepts, so mixed-script years such as
+# '१९50' are range-checked too.
+_FOUR_DIGITS_RE = re.compile(r"(?=(\d{4}))")
 
 
 def looks_like_year(password: str) -> Optional[str]:
-    for i in range(len(password) - 3):
-        chunk = password[i:i+4]
-        if chunk.isdigit():
-            year = int(chunk)
-            if 1900 <= year <= 2099:
-                return chunk
+    for m in _FOUR_DIGITS_RE.finditer(password):
+        if 1900 <= int(m.group(1)) <= 2099:
+            return m.group(1)
     return None
 
 
+@lru_cache(maxsize=None)
+def _run_re(min_run: int) -> "re.Pattern[str]":
+    return re.compile(r"(.)\1{%d}" % (min_run - 1), re.DOTALL)
+
+
 def repeated_runs(password: str, min_run: int = 3) -> Optional[str]:
-    if not password: return None
-    run_char = password[0]
-    run_len = 1
-    for c in password[1:]:
-        if c == run_char:
-            run_len += 1
-            if run_len >= min_run:
-                return run_char * run_len
-        else:
-            run_char = c
-            run_len = 1
-    return None
+    # The regex engine walks the string in C instead of a per-char loop
+    m = _run_re(min_run).search(password)
+    return m.group(0) if m else None
+
+
+@st.cache_resource(show_spinner=False)
+def _leet_table() -> Dict[int, str]:
+    return str.maketrans({ch: plain for plain, subs in LEET_MAP.items() for ch in subs})
 
 
-def deleet(s: str) -> str:
-    out = s.lower()
-    for plain, subs in LEET_MAP.items():
-        for ch in subs:
-            out = out.replace(ch, plain)
-    return out
+_LEET_TABLE = _leet_table()
 
 
 def is_palindrome(s: str) -> bool:
@@ -478,34 +601,55 @@ def is_palindrome(s: str) -> bool:
     return filtered == filtered[::-1] and len(filtered) >= 3
 
 
+@lru_cache(maxsize=256)
 def repeated_substring(s: str) -> Optional[str]:
-    n = len(s)
-    for l in range(1, n//2 + 1):
-        if n % l == 0:
-            sub = s[:l]
-            if sub * (n // l) == s:
-                return sub
-    return None
+    # s is a whole repetition iff it reappears inside s+s before offset len(s)
+    i = (s + s).find(s, 1)
+    return s[:i] if 0 < i < len(s) else None
+
+
+def _token_index(groups: Dict[str, Iterable[str]]) -> Dict[int, Dict[str, str]]:
+    """Bucket tagged tokens by length: {len: {token: tag}}."""
+    index: Dict[int, Dict[str, str]] = {}
+    for tag, tokens in groups.items():
+        for tok in tokens:
+            index.setdefault(len(tok), {})[tok] = tag
+    return index
+
+
+def _scan_tokens(text: str, index: Dict[int, Dict[str, str]]) -> Dict[str, Set[str]]:
+    # One slide per token length finds every tagged token in the text.
+    found: Dict[str, Set[str]] = {}
+    for size, table in index.items():
+        for i in range(len(text) - size + 1):
+            tok = text[i:i+size]
+            tag = table.get(tok)
+            if tag:
+                found.setdefault(tag, set()).add(tok)
+    return found
 
 
-def keyboard_walks(password: str, min_len: int = 4) -> List[str]:
-    p = password.lower()
-    findings = []
-    for row in KEYBOARD_ROWS:
-        for i in range(len(row) - min_len + 1):
-            seq = row[i:i+min_len]
-            if seq in p: findings.append(seq)
-        rev = row[::-1]
-        for i in range(len(rev) - min_len + 1):
-            seq = rev[i:i+min_len]
-            if seq in p: findings.append(seq)
-    return list(set(findings))
+@st.cache_resource(show_spinner=False)
+def _pattern_indexes() -> Tuple[Dict[int, Dict[str, str]], Dict[int, Dict[str, str]]]:
+    """(sequence/walk index, common-word index); shared read-only by all sessions."""
+    patterns = _token_index({
+        "seq": _window_set(_SEQUENCE_UNIVERSES, 3),
+        "kbd": _window_set(tuple(KEYBOARD_ROWS), 4),
+    })
+    return patterns, _token_index({"common": DEFAULT_DICT_SAMPLE})
 
 
-def pattern_penalties(password: str) -> Tuple[int, List[str]]:
+_PATTERN_INDEX, _COMMON_WORD_INDEX = _pattern_indexes()
+
+
+@lru_cache(maxsize=256)
+def pattern_penalties(password: str) -> Tuple[int, Tuple[str, ...]]:
     penalties = 0
     notes = []
-    seqs = find_sequences(password, 3)
+    # Lowercase once; the sequence/walk scan and the deleet pass share it
+    lower = password.lower()
+    hits = _scan_tokens(lower, _PATTERN_INDEX)
+    seqs = hits.get("seq")
     if seqs:
         penalties += 1 + min(3, len(seqs)//2)
         notes.append("Sequential patterns: " + ', '.join(seqs))
@@ -524,28 +668,29 @@ def pattern_penalties(password: str) -> Tuple[int, List[str]]:
     if is_palindrome(password):
         penalties += 1
         notes.append("Palindrome-like")
-    kw = keyboard_walks(password, 4)
+    kw = hits.get("kbd")
     if kw:
         penalties += 1
         notes.append("Keyboard walks: " + ', '.join(kw))
-    dl = deleet(password)
-    common_hits = [w for w in DEFAULT_DICT_SAMPLE if w in dl]
+    common_hits = _scan_tokens(lower.translate(_LEET_TABLE), _COMMON_WORD_INDEX).get("common")
     if common_hits:
         penalties += 1
-        notes.append("Common words after deleet: " + ', '.join(set(common_hits)))
-    return penalties, notes
+        notes.append("Common words after deleet: " + ', '.join(common_hits))
+    return penalties, tuple(notes)
 
 
-def strength_score(password: str) -> Tuple[int, List[str]]:
+@lru_cache(maxsize=256)
+def strength_score(password: str) -> Tuple[int, Tuple[str, ...]]:
     tips = []
     score = 0
     L = len(password)
     if L >= 8:  score += 2
     if L >= 12: score += 2
     if L >= 16: score += 1
-    ks, cs, flags = detect_charset_size(password)
+    cs, flags = detect_charset_size(password)
     score += int(flags["lower"]) + int(flags["upper"]) + int(flags["digit"]) + int(flags["symbol"]) 
-    if password.lower() not in WEAK_PASSWORDS:
+    weak = password.lower() in WEAK_PASSWORDS
+    if not weak:
         score += 1
     p, notes = pattern_penalties(password)
     score -= p
@@ -555,81 +700,252 @@ def strength_score(password: str) -> Tuple[int, List[str]]:
     if not flags["digit"]:  tips.append("Include digits.")
     if not flags["symbol"]: tips.append("Include special characters (!@#...).")
     if notes: tips.extend(notes)
-    if password.lower() in WEAK_PASSWORDS: tips.append("Avoid common or leaked passwords.")
-    return max(0, min(10, score)), tips
+    if weak: tips.append("Avoid common or leaked passwords.")
+    return max(0, min(10, score)), tuple(tips)
 
 # ========================= HIBP (Pwned Passwords) =========================
-@st.cache_data(show_spinner=False, ttl=60*30)
+# Range buckets are cached in process for 30 minutes. Setting
+# PWLAB_HIBP_CACHE to a file path also persists them with shelve at that
+# path (the dbm backend may add .db or .dat/.dir) for a day, across restarts and
+# shared by every user of the deployment. Off by default.
+HIBP_DISK_CACHE = os.environ.get("PWLAB_HIBP_CACHE") or None
+HIBP_DISK_TTL = 24 * 3600
+HIBP_DISK_KEY = "bin:{}"  # versioned: buckets are keyed by binary suffix
+
+
+@st.cache_resource(show_spinner=False)
+def _hibp_disk_lock() -> threading.Lock:
+    # shelve is not safe for concurrent writers; sessions share this lock
+    return threading.Lock()
+
+
+def _range_from_disk(prefix: str) -> Optional[Dict[bytes, bytes]]:
+    if not HIBP_DISK_CACHE: return None
+    try:
+        with _hibp_disk_lock(), shelve.open(HIBP_DISK_CACHE) as db:
+            entry = db.get(HIBP_DISK_KEY.format(prefix))
+    except Exception:
+        return None
+    if entry and time.time() - entry[0] < HIBP_DISK_TTL:
+        return entry[1]
+    return None
+
+
+def _range_to_disk(prefix: str, bucket: Dict[bytes, bytes]) -> None:
+    if not HIBP_DISK_CACHE: return
+    try:
+        with _hibp_disk_lock(), shelve.open(HIBP_DISK_CACHE) as db:
+            db[HIBP_DISK_KEY.format(prefix)] = (time.time(), bucket)
+    except Exception:
+        pass  # the disk cache is best effort
+
+
+@st.cache_resource(show_spinner=False)
+def hibp_session() -> requests.Session:
+    # One pooled keep-alive session for all sessions; 429/503 are retried
+    # with backoff (honouring Retry-After) instead of failing the check
+    session = requests.Session()
+    session.headers.update({"Add-Padding": "true", "User-Agent": "AdvancedPasswordLab/1.0"})
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 503), allowed_methods=("GET",))
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry))
+    return session
+
+
+@st.cache_resource(show_spinner=False, ttl=60*30)
+def _fetch_range(prefix: str, timeout: float = 6.0) -> Dict[bytes, bytes]:
+    # One k-anonymity bucket answers every password sharing this prefix.
+    # Failures raise, so they are retried next time rather than cached.
+    bucket = _range_from_disk(prefix)
+    if bucket is not None:
+        return bucket
+    r = hibp_session().get(f"https://api.pwnedpasswords.com/range/{prefix}", timeout=timeout)
+    r.raise_for_status()
+    # Key by the 35-hex-digit suffix as 18 raw bytes (left-padded with a
+    # zero nibble): half the size of the hex, and matches the digest directly.
+    # No UTF-8 decode; counts are parsed only on a hit.
+    pairs = (line.split(b":", 1) for line in r.content.splitlines() if b":" in line)
+    bucket = {binascii.unhexlify(b"0" + suffix): count for suffix, count in pairs}
+    _range_to_disk(prefix, bucket)
+    return bucket
+
+
 def hibp_breach_count(password: str, timeout: float = 6.0) -> Optional[int]:
     if not password: return None
-    sha1 = hashlib.sha1(password.encode("utf-8")).hexdigest().upper()
-    prefix, suffix = sha1[:5], sha1[5:]
-    url = f"https://api.pwnedpasswords.com/range/{prefix}"
-    headers = {"Add-Padding": "true", "User-Agent": "AdvancedPasswordLab/1.0"}
+    # Not a security use: HIBP only needs the digest as a lookup key
+    d = hashlib.sha1(password.encode("utf-8"), usedforsecurity=False).digest()
+    prefix = f"{d[0]:02X}{d[1]:02X}{d[2] >> 4:X}"
+    suffix = bytes((d[2] & 0x0F,)) + d[3:]
     try:
-        r = requests.get(url, headers=headers, timeout=timeout)
-        if r.status_code != 200:
-            return None
-        for line in r.text.splitlines():
-            parts = line.strip().split(":")
-            if len(parts) == 2 and parts[0] == suffix:
-                return int(parts[1])
-        return 0
+        return int(_fetch_range(prefix, timeout).get(suffix, 0))
     except Exception:
         return None
 
 # ========================= Attack Models =========================
 
-def estimate_bruteforce_time(keyspace_size: int, attempts_per_sec: float, average=True) -> float:
-    trials = keyspace_size / 2 if average else keyspace_size
-    return trials / max(attempts_per_sec, 1e-30)
+def _exp2(bits: float) -> float:
+    return 2.0 ** bits if bits < 1024 else math.inf
+
+
+def estimate_bruteforce_time(keyspace_bits: float, attempts_per_sec: float, average=True) -> float:
+    # Work in bits: a long passphrase's keyspace would overflow a float
+    trial_bits = keyspace_bits - 1 if average else keyspace_bits
+    return _exp2(trial_bits) / max(attempts_per_sec, 1e-30)
 
 
-def estimate_dictionary_time(password: str, dictionary: List[str], words_per_sec: float) -> Tuple[float, bool]:
-    pw_lower = password.lower()
-    dict_list = [w.strip().lower() for w in dictionary if w.strip()]
-    dict_set = set(dict_list)
-    if pw_lower in dict_set:
-        try_index = dict_list.index(pw_lower) + 1
-        return try_index / max(words_per_sec, 1e-30), True
-    attempts = 0
-    found = False
-    for w in dict_set:
-        attempts += 1
-        if w == pw_lower:
-            found = True
-            break
-        wc = w.capitalize()
-        attempts += 1
-        if wc == password:
-            found = True
-            break
-        for dlen in (1,2,3):
-            attempts += (10 ** dlen)
-            if password.startswith(w) or password.startswith(wc):
-                tail = password[len(w):] if password.startswith(w) else password[len(wc):]
-                if tail.isdigit() and 1 <= len(tail) <= dlen:
-                    found = True
-                    break
-        if found:
-            break
-    secs = attempts / max(words_per_sec, 1e-30)
-    return secs, found
-
-
-def estimate_hybrid_time(password: str, dictionary: List[str], attempts_per_sec: float) -> float:
+# Rule model: every word is tried as-is, capitalised, then with 1-3 trailing digits
+DICT_DIGIT_SUFFIXES = (1, 2, 3)
+DICT_TRIES_PER_WORD = 2 + sum(10 ** d for d in DICT_DIGIT_SUFFIXES)
+
+
+def dictionary_index(words: Tuple[str, ...]) -> Dict[str, int]:
+    """Map each lowercased word to its first position in attack order."""
+    index: Dict[str, int] = {}
+    pos = 0
+    for w in words:
+        key = w.strip().lower()
+        if not key: continue
+        # Reuse the loaded string when it is already normalised, so a
+        # lowercase wordlist is held in memory once rather than twice
+        index.setdefault(w if key == w else key, pos)
+        pos += 1
+    return index
+
+
+class Wordlist(NamedTuple):
+    """A loaded dictionary plus the lookup structures the attack models use."""
+    words: Tuple[str, ...]
+    index: Dict[str, int]
+
+
+def build_wordlist(words: Tuple[str, ...]) -> Wordlist:
+    return Wordlist(words, dictionary_index(words))
+
+
+def estimate_dictionary_time(password: str, wordlist: Wordlist, words_per_sec: float) -> Tuple[float, bool]:
+    index = wordlist.index
+    rate = max(words_per_sec, 1e-30)
+    pos = index.get(password.lower())
+    if pos is not None:
+        return (pos + 1) / rate, True
+    # Word + digit suffix: probe the few possible base words instead of
+    # walking the whole dictionary
+    hits = []
+    for k in DICT_DIGIT_SUFFIXES:
+        base, tail = password[:-k], password[-k:]
+        w = base.lower()
+        if base and tail.isdigit() and w in index and base in (w, w.capitalize()):
+            hits.append((index[w], k))
+    if hits:
+        pos, k = min(hits)
+        attempts = pos * DICT_TRIES_PER_WORD + 2 + sum(10 ** d for d in range(1, k + 1))
+        return attempts / rate, True
+    return len(index) * DICT_TRIES_PER_WORD / rate, False
+
+
+def estimate_hybrid_time(password: str, wordlist: Wordlist, attempts_per_sec: float) -> float:
     penalties, _ = pattern_penalties(password)
-    ks, _, _ = detect_charset_size(password)
-    if ks <= 0: ks = 1
-    if penalties >= 3:   eff = ks ** 0.5
-    elif penalties == 2: eff = ks ** 0.7
-    else:                eff = ks ** 0.9
-    trials = eff / 2
+    cs, _ = detect_charset_size(password)
+    bits = keyspace_entropy_bits(len(password), cs)
+    if penalties >= 3:   eff = 0.5
+    elif penalties == 2: eff = 0.7
+    else:                eff = 0.9
+    return _exp2(bits * eff - 1) / max(attempts_per_sec, 1e-30)
+
+
+def estimate_hybrid_time_vec(lengths: np.ndarray, charset_size: int, attempts_per_sec: float, exponent: float = 0.85) -> np.ndarray:
+    """Hybrid estimate for a whole sweep of lengths in one NumPy op."""
+    trials = np.power(float(charset_size), lengths * exponent) / 2.0
     return trials / max(attempts_per_sec, 1e-30)
 
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def length_chart_series(charset_size: int, max_len: int, brute_speed: float, dict_speed: float,
+                        hybrid_speed: float, n_words: int) -> Tuple[np.ndarray, ...]:
+    """(lengths, brute-force, dictionary, hybrid) series for the length chart."""
+    # The charset size doesn't depend on length, so every series is one array op
+    lengths = np.arange(1, max_len+1)
+    keyspace_times = np.exp2(lengths * math.log2(charset_size) - 1) / max(brute_speed, 1e-30)
+    dict_vis = np.minimum(n_words * np.maximum(1, lengths-4), 2_000_000) / max(dict_speed, 1e-30)
+    hybrid_vis = estimate_hybrid_time_vec(lengths, charset_size, hybrid_speed)
+    return lengths, keyspace_times, dict_vis, hybrid_vis
+
+
+class Entropies(NamedTuple):
+    cs: int
+    flags: Mapping[str, bool]
+    keyspace_bits: float
+    shannon_bits: float
+
+
+def compute_entropies(password: str) -> Entropies:
+    cs, flags = detect_charset_size(password)
+    return Entropies(cs, flags, keyspace_entropy_bits(len(password), cs), shannon_entropy_bits(password))
+
+
+class Analysis(NamedTuple):
+    score: int
+    tips: Tuple[str, ...]
+    cs: int
+    flags: Mapping[str, bool]
+    notes: Tuple[str, ...]
+    keyspace_bits: float
+    shannon_bits: float
+    bf_avg: float
+    bf_worst: float
+    dict_time: float
+    dict_hit: bool
+    hybrid_time: float
+
+
+def analyze_password(password: str, wordlist: Wordlist, brute_speed: float, dict_speed: float, hybrid_speed: float) -> Analysis:
+    """Everything the analyze tab shows, except the breach check and hash sample."""
+    score, tips = strength_score(password)
+    cs, flags, keyspace_bits, shannon_bits = compute_entropies(password)
+    _, notes = pattern_penalties(password)
+    dict_time, dict_hit = estimate_dictionary_time(password, wordlist, dict_speed)
+    return Analysis(
+        score, tips, cs, flags, notes, keyspace_bits, shannon_bits,
+        estimate_bruteforce_time(keyspace_bits, brute_speed, average=True),
+        estimate_bruteforce_time(keyspace_bits, brute_speed, average=False),
+        dict_time, dict_hit,
+        estimate_hybrid_time(password, wordlist, hybrid_speed),
+    )
+
 # ========================= Hashing Simulator =========================
+HASH_ALGOS = ("sha256", "sha1", "md5", "bcrypt") if HAS_BCRYPT else ("sha256", "sha1", "md5")
+BCRYPT_TARGET_SEC = 0.25
+
+
+@st.cache_resource(show_spinner=False)
+def bcrypt_cost8_seconds() -> float:
+    """One timed bcrypt hash at cost 8 on this host."""
+    start = time.perf_counter()
+    bcrypt.hashpw(b"calibration", bcrypt.gensalt(rounds=8))
+    return max(time.perf_counter() - start, 1e-6)
+
+
+def bcrypt_seconds(rounds: int) -> float:
+    # Each extra round doubles the work, so one timing covers every cost
+    return bcrypt_cost8_seconds() * 2.0 ** (rounds - 8)
+
+
+@st.cache_resource(show_spinner=False)
+def bcrypt_auto_rounds(target_sec: float = BCRYPT_TARGET_SEC) -> int:
+    """Pick the bcrypt cost that takes about target_sec on this host."""
+    return max(4, min(14, round(8 + math.log2(target_sec / bcrypt_cost8_seconds()))))
 
-def hash_simulation(password: str, algo: str = "sha256", bcrypt_rounds: int = 12) -> Tuple[str, float]:
+
+HASH_WORKERS = min(4, os.cpu_count() or 1)
+
+
+@st.cache_resource(show_spinner=False)
+def hash_executor() -> ThreadPoolExecutor:
+    # Shared by all sessions; bcrypt releases the GIL while it hashes, so
+    # concurrent samples scale with cores. Capped since each one is CPU-bound.
+    return ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="hash-sim")
+
+
+def hash_simulation(password: str, algo: str = "sha256", bcrypt_rounds: int = 12, real_bcrypt: bool = True) -> Tuple[str, float]:
     start = time.time()
     if algo.lower() == "md5":
         h = hashlib.md5(password.encode()).hexdigest()
@@ -646,6 +962,8 @@ def hash_simulation(password: str, algo: str = "sha256", bcrypt_rounds: int = 12
     if algo.lower() == "bcrypt":
         if not HAS_BCRYPT:
             return "bcrypt-not-installed", 0.0
+        if not real_bcrypt:
+            return f"<simulated bcrypt, cost {bcrypt_rounds}>", bcrypt_seconds(bcrypt_rounds)
         start2 = time.time()
         salt = bcrypt.gensalt(rounds=bcrypt_rounds)
         bh = bcrypt.hashpw(password.encode(), salt)
@@ -655,35 +973,49 @@ def hash_simulation(password: str, algo: str = "sha256", bcrypt_rounds: int = 12
 
 # ========================= Passphrase Generator =========================
 
-def generate_passphrase(num_words: int = 4, separator: str = " ", wordlist: Optional[List[str]] = None) -> str:
-    wl = wordlist or DICEWARE_SAMPLE
-    words = [random.choice(wl) for _ in range(num_words)]
-    return separator.join(words)
+PASSPHRASE_SEPARATORS = (" ", "-", "_")
+_SYSTEM_RANDOM = secrets.SystemRandom()
+
+
+def generate_passphrase(num_words: int = 4, separator: str = " ", wordlist: Optional[Tuple[str, ...]] = None) -> str:
+    # OS CSPRNG: a passphrase tool should not draw from Mersenne Twister
+    return separator.join(_SYSTEM_RANDOM.choices(wordlist or DICEWARE_SAMPLE, k=num_words))
 
 # ========================= Dictionary Loading =========================
-@st.cache_data(show_spinner=False)
-def load_dictionary(file) -> List[str]:
+MAX_DICT_WORDS = 500_000
+
+
+def load_dictionary(file) -> Tuple[str, ...]:
     if file is None:
         return DEFAULT_DICT_SAMPLE
     try:
-        content = file.read()
+        # Decode and walk the upload line by line, stopping at the cap, so a
+        # huge list never becomes one big string or a full list of lines.
+        # newline='' splits on \n, \r and \r\n; splitlines() then catches the
+        # rarer separators, so words match text.splitlines() on the whole file.
+        file.seek(0)
+        text = io.TextIOWrapper(file, encoding="utf-8", errors="ignore", newline="")
         try:
-            text = content.decode("utf-8", errors="ignore")
-        except Exception:
-            text = content.decode("latin-1", errors="ignore")
-        words = [w.strip() for w in text.splitlines() if w.strip()]
-        if len(words) > 500000:
-            words = words[:500000]
-        return words
+            words = (w.strip() for ln in text for w in ln.splitlines())
+            return tuple(islice(filter(None, words), MAX_DICT_WORDS))
+        finally:
+            text.detach()  # leave the upload open for later reruns
     except Exception:
         return DEFAULT_DICT_SAMPLE
 
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def load_wordlist(file_id: str, _file) -> Wordlist:
+    # Keyed by the upload's id rather than its bytes, so a rerun neither
+    # re-hashes the file nor copies the words; parsing and indexing run once
+    return build_wordlist(load_dictionary(_file))
+
 # ========================= PDF Report =========================
 
 def make_pdf_report(lang: str,
                     pw: str,
                     score: Optional[int],
-                    ks: Optional[int],
+                    ks: Optional[str],
                     charset_size: Optional[int],
                     Hk: Optional[float],
                     Hs: Optional[float],
@@ -701,19 +1033,17 @@ def make_pdf_report(lang: str,
     x = inch * 0.6
     y = h - inch * 0.7
 
-    def line(t, dy=14):
-        nonlocal y
-        c.drawString(x, y, t)
-        y -= dy
-
     c.setFont("Helvetica-Bold", 16)
-    line(tr(lang, "app_title"), 20)
-    c.setFont("Helvetica", 10)
+    c.drawString(x, y, tr(lang, "app_title"))
+
+    # Collect the body and emit it as one text object, not a drawString per line
+    lines: List[str] = []
+    line = lines.append
 
     display_pw = "(hidden)" if not pw else ("*" * min(8, len(pw))) + ("…" if len(pw) > 8 else "")
     line(f"Password (masked): {display_pw}")
     line(f"{tr(lang,'charset_size')}: {charset_size if charset_size is not None else 'n/a'}")
-    line(f"{tr(lang,'keyspace')}: {format(ks, ',') if ks is not None else 'n/a'}")
+    line(f"{tr(lang,'keyspace')}: {ks if ks is not None else 'n/a'}")
     line(f"{tr(lang,'keyspace_entropy')}: {Hk:.2f}" if Hk is not None else f"{tr(lang,'keyspace_entropy')}: n/a")
     line(f"{tr(lang,'shannon_entropy')}: {Hs:.2f}" if Hs is not None else f"{tr(lang,'shannon_entropy')}: n/a")
 
@@ -741,19 +1071,78 @@ def make_pdf_report(lang: str,
     line("  - Estimates depend on attacker speed & defenses (hashing/2FA/rate limits).")
     line("  - Use long, unique passphrases and a password manager.")
 
+    text = c.beginText(x, y - 20)
+    text.setFont("Helvetica", 10, leading=14)
+    text.textLines(lines)
+    c.drawText(text)
+
     c.showPage()
     c.save()
-    buffer.seek(0)
-    return buffer.read()
+    return buffer.getvalue()
 
 # ========================= Session History =========================
+HISTORY_MAX = 25
 if 'history' not in st.session_state:
-    st.session_state.history = []
+    st.session_state.history = deque(maxlen=HISTORY_MAX)
+if 'history_salt' not in st.session_state:
+    st.session_state.history_salt = secrets.token_bytes(16)
+if 'hibp_results' not in st.session_state:
+    st.session_state.hibp_results = {}
+if 'hash_results' not in st.session_state:
+    st.session_state.hash_results = {}
+HASH_RESULTS_MAX = 64
+
+
+def password_key(password: str) -> str:
+    """Keyed per-session fingerprint, so rows can be matched without keeping the password."""
+    return hashlib.blake2b(password.encode("utf-8"), digest_size=16, key=st.session_state.history_salt).hexdigest()
+
+
+def session_breach_count(password: str) -> Optional[int]:
+    # Remember answers per session so reruns and exports don't query again;
+    # failures are not stored, so the next request retries
+    results = st.session_state.hibp_results
+    key = password_key(password)
+    if key not in results:
+        count = hibp_breach_count(password)
+        if count is None: return None
+        results[key] = count
+    return results[key]
+
+
+def session_analysis(password: str, wordlist_id: str, wordlist: Wordlist,
+                     brute_speed: float, dict_speed: float, hybrid_speed: float) -> Analysis:
+    # Reruns triggered by other widgets reuse the last result instead of
+    # re-running every estimator on the same input
+    key = (password_key(password), wordlist_id, brute_speed, dict_speed, hybrid_speed)
+    cached = st.session_state.get('analysis_cache')
+    if cached and cached[0] == key:
+        return cached[1]
+    result = analyze_password(password, wordlist, brute_speed, dict_speed, hybrid_speed)
+    st.session_state.analysis_cache = (key, result)
+    return result
+
+
+def recall_hash(password: str, algo: str, rounds: int, real: bool = True) -> Optional[Tuple[str, float]]:
+    return st.session_state.hash_results.get((password_key(password), algo, rounds, real))
+
+
+def remember_hash(password: str, algo: str, rounds: int, result: Tuple[str, float], real: bool = True) -> Tuple[str, float]:
+    # Keyed by fingerprint, not plaintext; oldest entries are dropped first
+    results = st.session_state.hash_results
+    results[(password_key(password), algo, rounds, real)] = result
+    while len(results) > HASH_RESULTS_MAX:
+        results.pop(next(iter(results)))
+    return result
 
 
 def add_to_history(entry: Dict):
-    st.session_state.history.insert(0, entry)
-    st.session_state.history = st.session_state.history[:25]
+    # Re-saving a password replaces its earlier row instead of duplicating it
+    # (the deque drops the oldest row itself once it is full)
+    history = st.session_state.history
+    for old in [e for e in history if e.get('key') == entry.get('key')]:
+        history.remove(old)
+    history.appendleft(entry)
 
 # ========================= UI =========================
 # Language picker first (so we can translate everything below)
@@ -774,17 +1163,23 @@ with st.sidebar:
     brute_speed  = st.number_input(tr(lang_choice, "brute_speed"), value=1e9, step=1e7, format="%.0f")
     dict_speed   = st.number_input(tr(lang_choice, "dict_speed"),  value=2e4, step=1e3, format="%.0f")
     hybrid_speed = st.number_input(tr(lang_choice, "hybrid_speed"),value=5e7, step=1e6, format="%.0f")
-    bcrypt_rounds= st.slider(tr(lang_choice, "bcrypt_rounds"), min_value=4, max_value=16, value=12)
 
     st.subheader(tr(lang_choice, "dict_upload"))
     dict_file = st.file_uploader(tr(lang_choice, "upload_wordlist"), type=["txt"]) 
+    bcrypt_rounds = bcrypt_auto_rounds() if HAS_BCRYPT else 12
+    real_bcrypt = False
     if HAS_BCRYPT:
         st.success(tr(lang_choice, "bcrypt_ok"))
+        st.caption(tr(lang_choice, "bcrypt_rounds", n=bcrypt_rounds, ms=int(BCRYPT_TARGET_SEC * 1000)))
+        # Off by default: the timing is extrapolated from one calibration hash
+        real_bcrypt = st.checkbox(tr(lang_choice, "real_bcrypt"), value=False)
     else:
         st.warning(tr(lang_choice, "bcrypt_missing"))
 
-# Load dictionary (cached)
-dictionary = load_dictionary(dict_file)
+# Load dictionary (cached per upload)
+wordlist_id = dict_file.file_id if dict_file is not None else ""
+wordlist = load_wordlist(wordlist_id, dict_file)
+dictionary = wordlist.words
 
 # Tabs for clean UX
 tab_analyze, tab_visuals, tab_history, tab_about = st.tabs([
@@ -803,38 +1198,51 @@ with tab_analyze:
         st.session_state.last_password_raw = password
         st.session_state.last_password_masked = ('*'*min(8,len(password))) + ('…' if len(password)>8 else '')
 
-        score, tips_en = strength_score(password)
+        # Start the hash sample first so a slow bcrypt run overlaps the
+        # HIBP request and estimates instead of blocking after them
+        hash_algo = st.session_state.get("hash_algo", HASH_ALGOS[0])
+        hash_cached = recall_hash(password, hash_algo, bcrypt_rounds, real_bcrypt)
+        hash_future = None if hash_cached else hash_executor().submit(hash_simulation, password, hash_algo, bcrypt_rounds, real_bcrypt)
+
+        analysis = session_analysis(password, wordlist_id, wordlist, brute_speed, dict_speed, hybrid_speed)
+        score, tips_en = analysis.score, analysis.tips
         st.subheader(f"{tr(lang_choice,'strength')}: {score}/10")
         st.progress(score/10)
 
-        ks_val, cs, flags = detect_charset_size(password)
-        entropy_bits_keyspace = len(password) * (log2(cs) if cs>0 else 0)
-        entropy_bits_shannon  = shannon_entropy_bits(password)
+        cs, flags = analysis.cs, analysis.flags
+        entropy_bits_keyspace = analysis.keyspace_bits
+        entropy_bits_shannon  = analysis.shannon_bits
 
         st.write(f"**{tr(lang_choice,'entropy_keyspace')}**")
-        st.write(f"{tr(lang_choice,'charset_size')}: `{cs}` — {tr(lang_choice,'keyspace')}: `{ks_val:,}`")
+        st.write(f"{tr(lang_choice,'charset_size')}: `{cs}` — {tr(lang_choice,'keyspace')}: `{keyspace_label(cs, len(password))}`")
         st.write(f"{tr(lang_choice,'keyspace_entropy')}: `{entropy_bits_keyspace:.2f}` bits — {tr(lang_choice,'shannon_entropy')}: `{entropy_bits_shannon:.2f}` bits")
 
-        p_penalty, p_notes = pattern_penalties(password)
+        p_notes = analysis.notes
         if p_notes:
             st.warning(tr(lang_choice, "patterns_found") + ": " + "; ".join(p_notes))
 
-        breached_count = None
-        if online_check:
-            with st.spinner(tr(lang_choice, "checking_hibp")):
-                breached_count = hibp_breach_count(password)
+        # Query HIBP only on request, not on every rerun while typing; a
+        # stored verdict is shown only while the online check is enabled
+        breached_count = st.session_state.hibp_results.get(password_key(password)) if online_check else None
+        if online_check and breached_count is None:
+            if st.button(tr(lang_choice, "check_breaches")):
+                with st.spinner(tr(lang_choice, "checking_hibp")):
+                    breached_count = session_breach_count(password)
+                if breached_count is None:
+                    st.info(tr(lang_choice, "breach_unavailable"))
+            else:
+                st.info(tr(lang_choice, "breach_not_checked"))
         if breached_count is not None:
             if breached_count > 0:
                 st.error(tr(lang_choice, "found_breaches", n=f"{breached_count:,}"))
             else:
                 st.success("✅ " + tr(lang_choice, "not_found_breaches"))
-        else:
+        elif not online_check:
             st.info(tr(lang_choice, "breach_unavailable"))
 
-        avg_brute_time  = estimate_bruteforce_time(ks_val, brute_speed, average=True)
-        worst_brute_time= estimate_bruteforce_time(ks_val, brute_speed, average=False)
-        dict_time, dict_found = estimate_dictionary_time(password, dictionary, dict_speed)
-        hybrid_time = estimate_hybrid_time(password, dictionary, hybrid_speed)
+        avg_brute_time, worst_brute_time = analysis.bf_avg, analysis.bf_worst
+        dict_time, dict_found = analysis.dict_time, analysis.dict_hit
+        hybrid_time = analysis.hybrid_time
 
         st.subheader(tr(lang_choice, "estimates_header"))
         st.write(f"{tr(lang_choice,'brute_avg')}: {pretty_time(avg_brute_time)} — ({tr(lang_choice,'brute_worst')}: {pretty_time(worst_brute_time)})")
@@ -842,21 +1250,13 @@ with tab_analyze:
         st.write(f"{tr(lang_choice,'hybrid_attack')}: {pretty_time(hybrid_time)}")
 
         st.subheader(tr(lang_choice, "hash_sim_header"))
-        algo_options = ["sha256","sha1","md5","bcrypt"] if HAS_BCRYPT else ["sha256","sha1","md5"]
-        hash_algo = st.selectbox(tr(lang_choice, "hash_algo"), algo_options)
-        hash_val, hash_time = hash_simulation(password, algo=hash_algo, bcrypt_rounds=bcrypt_rounds)
+        st.selectbox(tr(lang_choice, "hash_algo"), HASH_ALGOS, key="hash_algo")
+        hash_val, hash_time = hash_cached or remember_hash(password, hash_algo, bcrypt_rounds, hash_future.result(), real_bcrypt)
         st.write(f"{tr(lang_choice,'hash_compute_time')}: {hash_time:.4f} sec")
         st.code(str(hash_val)[:120] + ("..." if len(str(hash_val))>120 else ""))
 
         st.subheader(tr(lang_choice, "tips_header"))
-        tips_map = {
-            "Increase length to at least 12 characters (passphrases are great).": tr(lang_choice, "tip_len"),
-            "Add lowercase letters.": tr(lang_choice, "tip_lower"),
-            "Add uppercase letters.": tr(lang_choice, "tip_upper"),
-            "Include digits.": tr(lang_choice, "tip_digit"),
-            "Include special characters (!@#...).": tr(lang_choice, "tip_symbol"),
-            "Avoid common or leaked passwords.": tr(lang_choice, "tip_common"),
-        }
+        tips_map = tips_map_for(lang_choice)
         rendered_any = False
         for t in tips_en:
             if t in tips_map:
@@ -867,6 +1267,7 @@ with tab_analyze:
 
         if st.button(tr(lang_choice, "save_to_history")):
             entry = {
+                'key': password_key(password),
                 'time': time.strftime('%Y-%m-%d %H:%M:%S'),
                 'masked': st.session_state.last_password_masked,
                 'score': score,
@@ -886,7 +1287,7 @@ with tab_visuals:
     colA, colB = st.columns([2,1])
     with colA:
         num_words = st.slider(tr(lang_choice, "words_in_pass"), min_value=3, max_value=8, value=4)
-        separator = st.selectbox(tr(lang_choice, "separator"), [" ", "-", "_"]) 
+        separator = st.selectbox(tr(lang_choice, "separator"), PASSPHRASE_SEPARATORS) 
         use_wordlist = st.checkbox(tr(lang_choice, "use_uploaded"), value=False)
     with colB:
         if st.button(tr(lang_choice, "generate_pass")):
@@ -902,40 +1303,42 @@ with tab_visuals:
             st.write(tr(lang_choice, "clipboard_note"))
 
     st.header(tr(lang_choice, "entropy_vs_length"))
-    selected_sets = st.multiselect(tr(lang_choice, "charsets_to_include"), list(CHARSETS.keys()), default=["Lowercase (a-z)", "Uppercase (A-Z)", "Digits (0-9)"])
-    max_len = st.slider(tr(lang_choice, "max_len_chart"), min_value=6, max_value=40, value=24)
-
-    lengths = list(range(1, max_len+1))
-    keyspace_times = []
-    dict_vis = []
-    hybrid_vis = []
-    for L in lengths:
-        ks_L, cs_L = keyspace_by_length(L, selected_sets)
-        keyspace_times.append(estimate_bruteforce_time(ks_L, brute_speed, average=True))
-        variants = min(len(dictionary) * max(1, L-4), 2_000_000)
-        dict_vis.append(variants / max(dict_speed, 1e-30))
-        eff = (ks_L ** 0.85)
-        hybrid_vis.append((eff / 2) / max(hybrid_speed, 1e-30))
-
-    fig1, ax1 = plt.subplots()
-    ax1.plot(lengths, [max(1e-10,t) for t in keyspace_times], marker='o', label='Brute-force (avg)')
-    ax1.plot(lengths, [max(1e-10,t) for t in dict_vis],      marker='o', label='Dictionary')
-    ax1.plot(lengths, [max(1e-10,t) for t in hybrid_vis],    marker='o', label='Hybrid')
-    ax1.set_yscale('log')
-    ax1.set_xlabel('Length')
-    ax1.set_ylabel('Estimated time (seconds, log)')
-    ax1.legend()
-    st.pyplot(fig1)
+    # Batch the chart controls: one rerun on submit instead of one per widget
+    with st.form("chart_form"):
+        selected_sets = st.multiselect(tr(lang_choice, "charsets_to_include"), list(CHARSETS.keys()), default=["Lowercase (a-z)", "Uppercase (A-Z)", "Digits (0-9)"])
+        max_len = st.slider(tr(lang_choice, "max_len_chart"), min_value=6, max_value=40, value=24)
+        st.form_submit_button(tr(lang_choice, "update_chart"))
+
+    _, cs_chart = keyspace_by_length(1, selected_sets)
+    lengths, keyspace_times, dict_vis, hybrid_vis = length_chart_series(cs_chart, max_len, brute_speed, dict_speed, hybrid_speed, len(dictionary))
+
+    # Vega-Lite draws it in the browser: only the small long-form table is
+    # sent, no server-side matplotlib render or PNG encode per rerun
+    chart_df = pd.DataFrame({
+        'Length': lengths,
+        'Brute-force (avg)': np.maximum(1e-10, keyspace_times),
+        'Dictionary': np.maximum(1e-10, dict_vis),
+        'Hybrid': np.maximum(1e-10, hybrid_vis),
+    }).melt('Length', var_name='Attack', value_name='Seconds')
+    st.altair_chart(
+        alt.Chart(chart_df).mark_line(point=True).encode(
+            x=alt.X('Length:Q', title='Length'),
+            y=alt.Y('Seconds:Q', scale=alt.Scale(type='log'), title='Estimated time (seconds, log)'),
+            color=alt.Color('Attack:N', title=None),
+        )
+    )
 
     st.subheader(tr(lang_choice, "composition_header"))
     sample = st.text_input(tr(lang_choice, "enter_sample"), key='comp_sample')
     if sample:
-        counts = [sum(1 for c in sample if c.islower()), sum(1 for c in sample if c.isupper()), sum(1 for c in sample if c.isdigit()), sum(1 for c in sample if not c.isalnum())]
+        counts = list(char_class_counts(sample))
         labels = ['lower','upper','digits','symbols']
         if sum(counts) == 0:
             st.info("Enter at least one character to show composition.")
         else:
-            fig2, ax2 = plt.subplots()
+            # Plain Figure: not registered with pyplot, so it is freed after rendering
+            fig2 = Figure()
+            ax2 = fig2.add_subplot()
             ax2.pie(counts, labels=labels, autopct='%1.1f%%')
             ax2.set_title('Composition')
             st.pyplot(fig2)
@@ -944,14 +1347,15 @@ with tab_visuals:
     if st.button(tr(lang_choice, "show_crack_times")):
         sample_pw = st.session_state.get('gen_pass', 'Tr0ub4dor!')
         rows = []
-        ks_s, cs_s, _ = detect_charset_size(sample_pw)
+        cs_s, _ = detect_charset_size(sample_pw)
+        bits_s = keyspace_entropy_bits(len(sample_pw), cs_s)
         for name, speed in [
             ('Online (10/sec)', 10),
             ('Slow hash (100/sec)', 100),
             ('Moderate GPU (1e7/sec)', 1e7),
             ('High-end GPU (1e9/sec)', 1e9),
         ]:
-            t = estimate_bruteforce_time(ks_s, speed, average=True)
+            t = estimate_bruteforce_time(bits_s, speed, average=True)
             rows.append({tr(lang_choice,'scenario'): name, tr(lang_choice,'time'): pretty_time(t)})
         st.table(pd.DataFrame(rows))
 
@@ -959,12 +1363,16 @@ with tab_visuals:
 with tab_history:
     st.header(tr(lang_choice, 'history_header'))
     if st.session_state.history:
-        df_hist = pd.DataFrame(st.session_state.history)
-        st.dataframe(df_hist)
-        csv = df_hist.to_csv(index=False).encode('utf-8')
-        st.download_button(tr(lang_choice,'download_csv'), data=csv, file_name='password_analysis_history.csv', mime='text/csv')
+        rows = [{k: v for k, v in e.items() if k != 'key'} for e in st.session_state.history]
+        st.table(rows)
+        # At most 25 rows: the csv module is plenty, no DataFrame needed
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+        st.download_button(tr(lang_choice,'download_csv'), data=buf.getvalue().encode('utf-8'), file_name='password_analysis_history.csv', mime='text/csv')
         if st.button(tr(lang_choice,'clear_history')):
-            st.session_state.history = []
+            st.session_state.history.clear()
             st.rerun()
     else:
         st.info(tr(lang_choice,'no_history'))
@@ -977,17 +1385,11 @@ with tab_history:
         elif 'last_password_raw' in st.session_state:
             pw = st.session_state.last_password_raw
         if pw:
-            score, _ = strength_score(pw)
-            ks_val, cs, _ = detect_charset_size(pw)
-            Hk = len(pw) * (log2(cs) if cs>0 else 0)
-            Hs = shannon_entropy_bits(pw)
-            breached = hibp_breach_count(pw) if online_check else None
-            bf_avg  = estimate_bruteforce_time(ks_val, brute_speed, average=True)
-            bf_worst= estimate_bruteforce_time(ks_val, brute_speed, average=False)
-            dict_t, dict_hit = estimate_dictionary_time(pw, dictionary, dict_speed)
-            hyb_t = estimate_hybrid_time(pw, dictionary, hybrid_speed)
-            _, hash_time = hash_simulation(pw, algo='sha256', bcrypt_rounds=bcrypt_rounds)
-            pdf_bytes = make_pdf_report(lang_choice, pw, score, ks_val, cs, Hk, Hs, breached, bf_avg, bf_worst, dict_t, dict_hit, hyb_t, 'sha256', hash_time)
+            # Reuses the analyze tab's result when it was for this password
+            a = session_analysis(pw, wordlist_id, wordlist, brute_speed, dict_speed, hybrid_speed)
+            breached = session_breach_count(pw) if online_check else None
+            _, hash_time = recall_hash(pw, 'sha256', bcrypt_rounds) or remember_hash(pw, 'sha256', bcrypt_rounds, hash_simulation(pw, algo='sha256', bcrypt_rounds=bcrypt_rounds))
+            pdf_bytes = make_pdf_report(lang_choice, pw, a.score, keyspace_label(a.cs, len(pw)), a.cs, a.keyspace_bits, a.shannon_bits, breached, a.bf_avg, a.bf_worst, a.dict_time, a.dict_hit, a.hybrid_time, 'sha256', hash_time)
             st.download_button(tr(lang_choice,'download_pdf'), data=pdf_bytes, file_name='password_report_extended.pdf', mime='application/pdf')
         else:
             st.warning(tr(lang_choice,'no_pass_for_pdf'))
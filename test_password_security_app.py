@@ -0,0 +1,43 @@
+import io
+
+import pytest
+
+import password_security_app as app
+
+
+def test_weak_password_tips_keep_every_pattern_note():
+    score, tips = app.strength_score("qwerty")
+    assert score == 0
+    assert "Common words after deleet: qwerty" in tips
+    assert "Avoid common or leaked passwords." in tips
+
+
+@pytest.mark.parametrize("password", ["qwerty", "p@ssw0rd2019", "aaa111abcabc", "Tr0ub4dor!", "zxcvbnm1990!!!"])
+def test_tips_include_all_pattern_notes(password):
+    _, tips = app.strength_score(password)
+    _, notes = app.pattern_penalties(password)
+    assert all(note in tips for note in notes)
+
+
+def test_cached_charset_flags_are_read_only():
+    _, flags = app.detect_charset_size("abc")
+    with pytest.raises(TypeError):
+        flags["upper"] = True
+    assert app.detect_charset_size("abc")[1]["upper"] is False
+
+
+@pytest.mark.parametrize("password, year", [("abc1999", "1999"), ("x९९2015", "2015"), ("१९50!", "१९50"), ("١972", "١972"), ("18992100", None)])
+def test_year_detection_accepts_any_decimal_digits(password, year):
+    assert app.looks_like_year(password) == year
+
+
+@pytest.mark.parametrize("charset, length, label", [(10, 23, "≈ 1.00 × 10^23"), (10, 30, "≈ 1.00 × 10^30"), (95, 8, "6,634,204,312,890,625"), (95, 12, "≈ 5.40 × 10^23")])
+def test_keyspace_label_carries_rounded_mantissa(charset, length, label):
+    assert app.keyspace_label(charset, length) == label
+
+
+def test_load_dictionary_matches_decoded_splitlines():
+    raw = b"alpha\rbeta\r\n\xff\xfe\n\xc2\xa0gamma\xe3\x80\x80\ndelta\x0bepsilon\n"
+    upload = io.BytesIO(raw)
+    assert app.load_dictionary(upload) == ("alpha", "beta", "gamma", "delta", "epsilon")
+    assert not upload.closed